@@ -0,0 +1,7 @@
+USE STADVDB;
+
+-- Adds the row version column used by optimistic (compare-and-set) rating updates.
+-- Run this on every node AFTER importing node1_central.sql / node2_fragment.sql /
+-- node3_fragment.sql (the dumps use column-less INSERTs, so the column is added afterwards).
+ALTER TABLE movies
+  ADD COLUMN version INT UNSIGNED NOT NULL DEFAULT 0;
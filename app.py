@@ -1,4 +1,5 @@
 import json
+import random
 import time
 
 import mysql.connector
@@ -44,6 +45,67 @@ def log_failed_transaction(local_node_conn, target_node, query, params):
         print(f"Failed to log transaction: {e}")
 
 
+# MySQL error codes that are safe to retry from the top of the transaction
+# 1205 = ER_LOCK_WAIT_TIMEOUT, 1213 = ER_LOCK_DEADLOCK
+RETRYABLE_ERRNOS = (1205, 1213)
+
+CONCURRENCY_MODES = ("pessimistic", "optimistic")
+
+
+# --- HELPER: Jittered Backoff for Retries ---
+def get_backoff_delay(attempt):
+    # Exponential cap with "full jitter" so retrying writers don't collide again
+    cap = min(db_config.TXN_BACKOFF_MAX, db_config.TXN_BACKOFF_BASE * (2**attempt))
+    return random.uniform(0, cap)
+
+
+# --- HELPER: Parse Optional Non-Negative Integer Inputs ---
+def parse_non_negative_int(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value if value >= 0 else None
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return None
+
+
+# --- HELPER: Error Message (Points at the migration if `version` is missing) ---
+def describe_db_error(e, node_name):
+    if e.errno == 1054 and "version" in str(e):  # ER_BAD_FIELD_ERROR
+        return f"{e} -- run add_row_version.sql on {node_name}"
+    return str(e)
+
+
+# --- HELPER: Unlocked Version Read (for Optimistic Updates) ---
+# Runs in autocommit mode, where InnoDB always does a consistent (nonlocking) read.
+# Inside a transaction, SERIALIZABLE would turn this SELECT into a shared-lock read.
+def read_row_version(conn, cursor, year, target_id):
+    conn.autocommit = True
+    try:
+        if target_id:
+            cursor.execute(
+                "SELECT id, version FROM movies WHERE id = %s", (target_id,)
+            )
+        else:
+            cursor.execute(
+                "SELECT id, version FROM movies WHERE year = %s LIMIT 1", (year,)
+            )
+        return cursor.fetchone()
+    finally:
+        conn.autocommit = False
+
+
+# --- HELPER: Compare-and-Set Rating Update ---
+# Only succeeds if the row still has the version the writer started from.
+def compare_and_set_rating(cursor, row_id, new_rating, expected_version):
+    cursor.execute(
+        "UPDATE movies SET rating = %s, version = version + 1 WHERE id = %s AND version = %s",
+        (new_rating, row_id, expected_version),
+    )
+    return cursor.rowcount == 1
+
+
 # =====================================================
 #  FEATURE 1: CRUD with FAILURE HANDLING
 # =====================================================
@@ -269,7 +331,27 @@ def execute_transaction():
     year = int(data.get("year", 2000))
     action = data.get("action")
     isolation_level = data.get("isolation_level", "READ COMMITTED")
+    concurrency_mode = data.get("concurrency_mode", "pessimistic")
     sleep_time = data.get("sleep", 0)
+    max_retries = parse_non_negative_int(
+        data.get("max_retries", db_config.TXN_MAX_RETRIES)
+    )
+    expected_version = None  # Optional: client-side expected version
+    if data.get("version") is not None:
+        expected_version = parse_non_negative_int(data.get("version"))
+
+    if concurrency_mode not in CONCURRENCY_MODES:
+        return jsonify(
+            {"error": f"concurrency_mode must be one of {CONCURRENCY_MODES}"}
+        ), 400
+    if max_retries is None:
+        return jsonify({"error": "max_retries must be a non-negative integer"}), 400
+    if max_retries > db_config.TXN_MAX_RETRIES_LIMIT:
+        return jsonify(
+            {"error": f"max_retries must be at most {db_config.TXN_MAX_RETRIES_LIMIT}"}
+        ), 400
+    if data.get("version") is not None and expected_version is None:
+        return jsonify({"error": "version must be a non-negative integer"}), 400
 
     # Route to correct node
     node_name = get_fragment_node(year)
@@ -279,60 +361,152 @@ def execute_transaction():
         return jsonify({"error": "Connection failed"}), 500
 
     conn.autocommit = False
-
-    results = None
-    try:
-        cursor = conn.cursor(dictionary=True)
-
-        # 1. Set Isolation Level
-        cursor.execute(f"SET SESSION TRANSACTION ISOLATION LEVEL {isolation_level}")
-
-        # 2. Start Transaction
-        conn.start_transaction()
-        print(f"[{node_name}] Transaction Started ({isolation_level})...")
-
-        if action == "read":
-            cursor.execute("SELECT * FROM movies WHERE year = %s LIMIT 1", (year,))
-            results = cursor.fetchall()
-            if sleep_time > 0:
-                time.sleep(sleep_time)  # Simulate holding shared lock
-
-        elif action == "write":
-            new_rating = data.get("rating")
-            target_id = data.get("id")  # <--- NEW: Accept specific ID
-
-            if target_id:
-                # Strict collision test: Update specific ID
-                print(f"Updating specific ID: {target_id}")
+    cursor = conn.cursor(dictionary=True)
+
+    # Optimistic writes capture the row and its version ONCE, outside the locking
+    # transaction. Retries reuse it, so a writer that lost the race still fails
+    # the compare-and-set (409) instead of overwriting the winner.
+    target_row = None
+    if action == "write" and concurrency_mode == "optimistic":
+        try:
+            target_row = read_row_version(conn, cursor, year, data.get("id"))
+        except Error as e:
+            print(f"Transaction Error: {e}")
+            cursor.close()
+            conn.close()
+            return jsonify(
+                {"status": "error", "message": describe_db_error(e, node_name)}
+            ), 500
+
+        if not target_row:
+            cursor.close()
+            conn.close()
+            return jsonify({"status": "error", "message": "row not found"}), 404
+
+        if expected_version is None:
+            expected_version = target_row["version"]
+
+        if sleep_time > 0:
+            print(f"Sleeping for {sleep_time}s (no lock held)...")
+            time.sleep(sleep_time)
+
+    attempt = 0
+    while True:
+        results = None
+        try:
+            # 1. Set Isolation Level
+            cursor.execute(
+                f"SET SESSION TRANSACTION ISOLATION LEVEL {isolation_level}"
+            )
+
+            # 2. Start Transaction
+            conn.start_transaction()
+            print(
+                f"[{node_name}] Transaction Started "
+                f"({isolation_level}, {concurrency_mode}, attempt {attempt + 1})..."
+            )
+
+            if action == "read":
                 cursor.execute(
-                    "UPDATE movies SET rating = %s WHERE id = %s",
-                    (new_rating, target_id),
+                    "SELECT * FROM movies WHERE year = %s LIMIT 1", (year,)
                 )
-            else:
-                # Loose test: Update any movie in that year (Existing logic)
-                cursor.execute(
-                    "UPDATE movies SET rating = %s WHERE year = %s LIMIT 1",
-                    (new_rating, year),
+                results = cursor.fetchall()
+                if sleep_time > 0:
+                    time.sleep(sleep_time)  # Simulate holding shared lock
+
+            elif action == "write" and concurrency_mode == "optimistic":
+                if compare_and_set_rating(
+                    cursor, target_row["id"], data.get("rating"), expected_version
+                ):
+                    results = {"id": target_row["id"], "version": expected_version + 1}
+                else:
+                    # Someone else won: roll back and report the version that beat us
+                    conn.rollback()
+                    current = read_row_version(conn, cursor, year, target_row["id"])
+                    print(f"[{node_name}] Version conflict on {target_row['id']}")
+                    cursor.close()
+                    conn.close()
+                    return jsonify(
+                        {
+                            "status": "conflict",
+                            "node": node_name,
+                            "data": {
+                                "id": target_row["id"],
+                                "expected_version": expected_version,
+                                "current_version": current["version"]
+                                if current
+                                else None,
+                            },
+                            "attempts": attempt + 1,
+                        }
+                    ), 409
+
+            elif action == "write":
+                new_rating = data.get("rating")
+                target_id = data.get("id")  # <--- NEW: Accept specific ID
+
+                if target_id:
+                    # Strict collision test: Update specific ID
+                    print(f"Updating specific ID: {target_id}")
+                    cursor.execute(
+                        "UPDATE movies SET rating = %s, version = version + 1 WHERE id = %s",
+                        (new_rating, target_id),
+                    )
+                else:
+                    # Loose test: Update any movie in that year (Existing logic)
+                    cursor.execute(
+                        "UPDATE movies SET rating = %s, version = version + 1 WHERE year = %s LIMIT 1",
+                        (new_rating, year),
+                    )
+
+                rows_affected = cursor.rowcount
+                print(f"[{node_name}] Rows affected/locked: {rows_affected}")
+
+                if sleep_time > 0:
+                    print(f"Sleeping for {sleep_time}s (holding lock)...")
+                    time.sleep(sleep_time)
+
+            # 3. Commit
+            conn.commit()
+            cursor.close()
+            conn.close()
+            return jsonify(
+                {
+                    "status": "success",
+                    "node": node_name,
+                    "data": results,
+                    "attempts": attempt + 1,
+                }
+            )
+
+        except Error as e:
+            print(f"Transaction Error: {e}")
+            if conn.is_connected():
+                conn.rollback()
+
+            # 4. Retry Deadlocks / Lock Wait Timeouts with jittered backoff
+            if (
+                e.errno in RETRYABLE_ERRNOS
+                and attempt < max_retries
+                and conn.is_connected()
+            ):
+                delay = get_backoff_delay(attempt)
+                attempt += 1
+                print(
+                    f"[{node_name}] Retrying in {delay:.3f}s (attempt {attempt + 1})..."
                 )
-
-            rows_affected = cursor.rowcount
-            print(f"[{node_name}] Rows affected/locked: {rows_affected}")
-
-            if sleep_time > 0:
-                print(f"Sleeping for {sleep_time}s (holding lock)...")
-                time.sleep(sleep_time)
-
-        # 3. Commit
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return jsonify({"status": "success", "node": node_name, "data": results})
-
-    except Error as e:
-        print(f"Transaction Error: {e}")
-        if conn.is_connected():
-            conn.rollback()
-        return jsonify({"status": "error", "message": str(e)}), 500
+                time.sleep(delay)
+                continue
+
+            cursor.close()
+            conn.close()
+            return jsonify(
+                {
+                    "status": "error",
+                    "message": describe_db_error(e, node_name),
+                    "attempts": attempt + 1,
+                }
+            ), 500
 
 
 if __name__ == "__main__":
@@ -25,3 +25,9 @@ NODE_CONFIG = {
 
 # Fragmentation Rule (The "Cutoff" Year)
 FRAGMENTATION_YEAR = 1980
+
+# Retry Policy for /transaction (Deadlock / Lock Wait Timeout)
+TXN_MAX_RETRIES = 3  # Extra attempts after the first one
+TXN_MAX_RETRIES_LIMIT = 10  # Ceiling for the per-request "max_retries" override
+TXN_BACKOFF_BASE = 0.05  # Seconds, doubled on every attempt
+TXN_BACKOFF_MAX = 1.0  # Seconds, upper bound before jitter
@@ -62,13 +62,21 @@ def check_movie_exists(base_url, year, movie_id):
 
 
 def simulate_concurrency_user(
-    base_url, user_id, action, isolation, sleep_time, movie_id, result_collector
+    base_url,
+    user_id,
+    action,
+    isolation,
+    sleep_time,
+    movie_id,
+    result_collector,
+    mode="pessimistic",
 ):
     payload = {
         "year": CONCURRENCY_YEAR,
         "id": movie_id,
         "action": action,
         "isolation_level": isolation,
+        "concurrency_mode": mode,
         "sleep": sleep_time,
         "rating": 5.5 if user_id == 1 else 9.9,
     }
@@ -98,7 +106,7 @@ def simulate_concurrency_user(
 def run_concurrency_matrix():
     print("\n" + "=" * 60)
     print("PART 1: CONCURRENCY & TRANSPARENCY CHECK")
-    print("Goal: Prove consistency across 3 Cases x 4 Isolation Levels x 3 Nodes")
+    print("Goal: Prove consistency across 4 Cases x 4 Isolation Levels x 3 Nodes")
     print("=" * 60)
 
     for node_config in NODES:
@@ -131,18 +139,37 @@ def run_concurrency_matrix():
                 base_url, "C3: Write-Write", iso, "write", "write", 2, target_id
             )
 
+            # CASE 4: Optimistic Write-Write (Expect: Not blocked, User 1 gets 409)
+            run_concurrency_case(
+                base_url,
+                "C4: Optimistic ",
+                iso,
+                "write",
+                "write",
+                2,
+                target_id,
+                mode="optimistic",
+            )
+
 
 def run_concurrency_case(
-    base_url, case_name, isolation, t1_action, t2_action, t1_sleep, movie_id
+    base_url,
+    case_name,
+    isolation,
+    t1_action,
+    t2_action,
+    t1_sleep,
+    movie_id,
+    mode="pessimistic",
 ):
     results = {}
     t1 = threading.Thread(
         target=simulate_concurrency_user,
-        args=(base_url, 1, t1_action, isolation, t1_sleep, movie_id, results),
+        args=(base_url, 1, t1_action, isolation, t1_sleep, movie_id, results, mode),
     )
     t2 = threading.Thread(
         target=simulate_concurrency_user,
-        args=(base_url, 2, t2_action, isolation, 0, movie_id, results),
+        args=(base_url, 2, t2_action, isolation, 0, movie_id, results, mode),
     )
 
     t1.start()
@@ -162,6 +189,19 @@ def run_concurrency_case(
         status = "BLOCKED    "  # Padding for alignment
 
     print(f"       -> {case_name} | Time: {duration}s | Val: {val} | Result: {status}")
+    if mode == "optimistic":
+        # User 2 commits first (User 1 is still "thinking"), so User 1 must get a 409
+        u1_status = results.get(1, {}).get("status", "N/A")
+        u2_status = u2_stats.get("status", "N/A")
+        outcome = "UNEXPECTED"  # e.g. 500s from a node missing add_row_version.sql
+        if u1_status == 409 and u2_status == 200:
+            outcome = "CONFLICT DETECTED"
+        elif u1_status == 200 and u2_status == 200:
+            outcome = "LOST UPDATE"
+        print(
+            f"          Expected: U1=409, U2=200 | Observed: U1={u1_status}, "
+            f"U2={u2_status} | Result: {outcome}"
+        )
 
 
 # ==============================================================================
@@ -10,6 +10,7 @@ CREATE TABLE movies (
   year SMALLINT UNSIGNED NOT NULL, -- Vital for Fragmentation (Node 2 vs 3)
   rating DECIMAL(3,1) NULL,        -- Vital for Concurrency (Update conflict target)
   genre TEXT NULL,                 -- Useful for Slicing/Filtering
+  version INT UNSIGNED NOT NULL DEFAULT 0, -- Row version for optimistic (compare-and-set) updates
   PRIMARY KEY (id),
   INDEX idx_year (year)            -- Speeds up the fragmentation queries
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
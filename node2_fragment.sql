@@ -3,6 +3,8 @@
 -- Host: localhost    Database: STADVDB
 -- ------------------------------------------------------
 -- Server version	9.4.0
+--
+-- NOTE: After importing this dump, run add_row_version.sql on this node (adds movies.version)
 
 /*!40101 SET @OLD_CHARACTER_SET_CLIENT=@@CHARACTER_SET_CLIENT */;
 /*!40101 SET @OLD_CHARACTER_SET_RESULTS=@@CHARACTER_SET_RESULTS */;